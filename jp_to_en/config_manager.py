@@ -4,18 +4,87 @@ Configuration manager module for jp-to-en.
 This module handles loading and saving configuration, including API keys.
 """
 
+import copy
+import importlib.util
 import json
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import ClassVar, Dict, Any, Optional, Tuple
+
+# Optional faster JSON backend
+_HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+if _HAS_ORJSON:
+    import orjson
 
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file in a single read.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    data = path.read_bytes()
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """
+    Serialize data and write it to a JSON file in a single write.
+    
+    Args:
+        path: Path to the JSON file
+        obj: Data to serialize
+    """
+    if _HAS_ORJSON:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode('utf-8')
+    path.write_bytes(data)
+
+
+@lru_cache(maxsize=128)
+def _split_key(key_path: str) -> Tuple[str, ...]:
+    """
+    Split a dot-separated configuration key path.
+    
+    Args:
+        key_path: Dot-separated path to the configuration key
+        
+    Returns:
+        Tuple of path components
+    """
+    return tuple(key_path.split('.'))
+
+
+@lru_cache(maxsize=1)
+def _read_default_config(default_config_path: Path) -> Dict[str, Any]:
+    """
+    Read the bundled default configuration, once per process.
+    
+    Args:
+        default_config_path: Path to the default configuration file
+        
+    Returns:
+        Default configuration dictionary (shared; callers must copy it)
+    """
+    return _read_json(default_config_path)
+
+
 class ConfigManager:
     """Manager for loading and saving configuration."""
     
+    _default_instance: ClassVar[Optional["ConfigManager"]] = None
+    
     def __init__(self, config_dir: Optional[str] = None):
         """
         Initialize the configuration manager.
@@ -46,6 +115,21 @@ class ConfigManager:
         self._load_config()
         self._load_credentials()
     
+    @classmethod
+    def get_default(cls) -> "ConfigManager":
+        """
+        Get the shared configuration manager for the default directory.
+        
+        The instance is created on first use, so configuration files are
+        only read once per process.
+        
+        Returns:
+            Shared ConfigManager instance
+        """
+        if cls._default_instance is None:
+            cls._default_instance = cls()
+        return cls._default_instance
+    
     def _load_default_config(self) -> Dict[str, Any]:
         """
         Load default configuration.
@@ -58,8 +142,7 @@ class ConfigManager:
         
         if default_config_path.exists():
             try:
-                with open(default_config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return copy.deepcopy(_read_default_config(default_config_path))
             except Exception as e:
                 logger.warning(f"Failed to load default config: {e}")
                 
@@ -80,8 +163,7 @@ class ConfigManager:
         """Load configuration from file."""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
+                user_config = _read_json(self.config_file)
                     
                 # Merge with default config (user config takes precedence)
                 self._deep_update(self._config, user_config)
@@ -93,14 +175,16 @@ class ConfigManager:
         """Load credentials from file."""
         if self.credentials_file.exists():
             try:
-                with open(self.credentials_file, 'r', encoding='utf-8') as f:
-                    self._credentials = json.load(f)
+                self._credentials = _read_json(self.credentials_file)
             except Exception as e:
                 logger.warning(f"Failed to load credentials file: {e}")
     
     def _deep_update(self, d: Dict[str, Any], u: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Recursively update a dictionary.
+        Deep-merge a dictionary into another, in place.
+        
+        Nested dictionaries are merged with an explicit work stack rather than
+        recursion. Subtrees that do not exist in ``d`` are assigned by reference.
         
         Args:
             d: Dictionary to update
@@ -109,11 +193,15 @@ class ConfigManager:
         Returns:
             Updated dictionary
         """
-        for k, v in u.items():
-            if isinstance(v, dict) and k in d and isinstance(d[k], dict):
-                self._deep_update(d[k], v)
-            else:
-                d[k] = v
+        stack = [(d, u)]
+        while stack:
+            target, updates = stack.pop()
+            for k, v in updates.items():
+                existing = target.get(k)
+                if type(v) is dict and type(existing) is dict:
+                    stack.append((existing, v))
+                else:
+                    target[k] = v
         return d
     
     def save_config(self) -> bool:
@@ -124,8 +212,7 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2)
+            _write_json(self.config_file, self._config)
             return True
         except Exception as e:
             logger.error(f"Failed to save config file: {e}")
@@ -139,8 +226,7 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            with open(self.credentials_file, 'w', encoding='utf-8') as f:
-                json.dump(self._credentials, f, indent=2)
+            _write_json(self.credentials_file, self._credentials)
             return True
         except Exception as e:
             logger.error(f"Failed to save credentials file: {e}")
@@ -163,7 +249,7 @@ class ConfigManager:
             key_path: Dot-separated path to the configuration key
             value: Value to set
         """
-        keys = key_path.split('.')
+        keys = _split_key(key_path)
         config = self._config
         
         # Navigate to the parent of the target key
@@ -186,7 +272,7 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        keys = key_path.split('.')
+        keys = _split_key(key_path)
         config = self._config
         
         # Navigate to the target key
@@ -5,25 +5,107 @@ This module provides functions to detect Japanese text in source code comments.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from types import ModuleType
 from typing import List, Optional, Tuple
 
-import langdetect
-from langdetect import DetectorFactory
-from langdetect.lang_detect_exception import LangDetectException
+# langdetect is imported on first use; loading it is slow and most callers
+# never reach the statistical detection path
+_langdetect: Optional[ModuleType] = None
 
-# Set fixed random seed for consistent language detection
-DetectorFactory.seed = 0
+# Unicode ranges for Japanese characters
+# Hiragana: U+3040-U+309F
+# Katakana: U+30A0-U+30FF
+# Kanji: U+4E00-U+9FFF
+_JP_CHAR_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+_JP_CHAR_RUN_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]+')
 
+# Words containing Japanese text: the characters above plus CJK punctuation
+# (U+3000-U+303F) and full-width forms (U+FF00-U+FFEF), together with any
+# characters attached to them without whitespace (e.g. "DataProcessorを" or
+# "config.jsonを"). A word ends at whitespace, at "。！？", and at ".!?" when
+# followed by whitespace or the end of the text; the sentence end itself is
+# left out. The lookbehind anchors each attempt at the start of a word, so a
+# word is scanned once.
+_JP_WORD_RE = re.compile(
+    r'(?<![^\s。！？])'
+    r'(?:[^\s.!?\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF\u3000-\u303F\uFF00-\uFFEF]'
+    r'|[.!?](?=[^\s。！？]))*'
+    r'(?![。！？])[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF\u3000-\u303F\uFF00-\uFFEF]'
+    r'(?:[^\s.!?。！？]|[.!?](?=[^\s。！？]))*'
+)
 
-@dataclass
+# In UTF-8, every Japanese character above starts with a lead byte in
+# E3 (U+3000-U+3FFF) or E4-E9 (U+4000-U+9FFF)
+_JP_LEAD_BYTES = tuple(bytes([b]) for b in range(0xE3, 0xEA))
+
+# Sentence and line ends between Japanese words; words separated by anything
+# else (e.g. "これは a test です" or "これは config.json です") belong to the
+# same span
+_SPAN_BREAK_RE = re.compile(r'[.!?](?!\S)|[\n。！？]')
+
+
+@dataclass(slots=True, frozen=True)
 class JapaneseTextSpan:
-    """A span of Japanese text found in a string."""
-    text: str
+    """
+    A span of Japanese text found in a string.
+    
+    The span only stores offsets into the analyzed string; the text and its
+    context are sliced from it when accessed.
+    """
+    source: str = field(repr=False)  # The analyzed string
     start_pos: int
     end_pos: int
-    context_before: str = ""
-    context_after: str = ""
+    context_size: int = 50  # Number of context characters before and after
+    
+    @property
+    def text(self) -> str:
+        """The Japanese text of the span."""
+        return self.source[self.start_pos:self.end_pos]
+    
+    @property
+    def context_before(self) -> str:
+        """Text appearing before the span."""
+        return self.source[max(0, self.start_pos - self.context_size):self.start_pos]
+    
+    @property
+    def context_after(self) -> str:
+        """Text appearing after the span."""
+        return self.source[self.end_pos:self.end_pos + self.context_size]
+    
+    def before_endswith(self, suffix: str) -> bool:
+        """
+        Check if the context before the span ends with a suffix.
+        
+        Equivalent to ``context_before.endswith(suffix)`` without slicing the
+        context out of the source.
+        
+        Args:
+            suffix: The suffix to check for
+        
+        Returns:
+            True if the context before the span ends with the suffix
+        """
+        return self.source.endswith(
+            suffix, max(0, self.start_pos - self.context_size), self.start_pos
+        )
+    
+    def after_startswith(self, prefix: str) -> bool:
+        """
+        Check if the context after the span starts with a prefix.
+        
+        Equivalent to ``context_after.startswith(prefix)`` without slicing the
+        context out of the source.
+        
+        Args:
+            prefix: The prefix to check for
+        
+        Returns:
+            True if the context after the span starts with the prefix
+        """
+        return self.source.startswith(
+            prefix, self.end_pos, self.end_pos + self.context_size
+        )
 
 
 def contains_japanese_chars(text: str) -> bool:
@@ -36,12 +118,57 @@ def contains_japanese_chars(text: str) -> bool:
     Returns:
         True if the text contains Japanese characters, False otherwise
     """
-    # Unicode ranges for Japanese characters
-    # Hiragana: U+3040-U+309F
-    # Katakana: U+30A0-U+30FF
-    # Kanji: U+4E00-U+9FAF
-    japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-    return bool(japanese_pattern.search(text))
+    # The compiled search beats a per-character code point bitmap lookup
+    return _JP_CHAR_RE.search(text) is not None
+
+
+def contains_japanese_bytes(data: bytes) -> bool:
+    """
+    Check if UTF-8 encoded data may contain Japanese characters.
+    
+    This only looks for the lead bytes Japanese characters are encoded with,
+    so it can report false positives but never false negatives.
+    
+    Args:
+        data: UTF-8 encoded text
+        
+    Returns:
+        True if the data may contain Japanese characters, False otherwise
+    """
+    # One memchr-backed substring search per lead byte is far faster than a
+    # bytes regex character class, which steps through the data byte by byte
+    return any(lead in data for lead in _JP_LEAD_BYTES)
+
+
+def _load_langdetect() -> ModuleType:
+    """
+    Import langdetect on first use.
+    
+    Returns:
+        The langdetect module
+    """
+    global _langdetect
+    if _langdetect is None:
+        import langdetect
+        
+        # Set fixed random seed for consistent language detection
+        langdetect.DetectorFactory.seed = 0
+        _langdetect = langdetect
+    return _langdetect
+
+
+def _count_japanese_chars(text: str) -> int:
+    """
+    Count the Japanese characters (Hiragana, Katakana, or Kanji) in the text.
+    
+    Args:
+        text: The text to check
+        
+    Returns:
+        Number of Japanese characters in the text
+    """
+    # Matching whole runs keeps the number of match objects small
+    return len(''.join(_JP_CHAR_RUN_RE.findall(text)))
 
 
 def is_japanese_text(text: str, min_confidence: float = 0.5) -> bool:
@@ -59,15 +186,61 @@ def is_japanese_text(text: str, min_confidence: float = 0.5) -> bool:
     if not contains_japanese_chars(text):
         return False
     
+    return _is_japanese_text_known_contains(text, min_confidence)
+
+
+def detect_batch(texts: List[str], min_confidence: float = 0.5) -> List[bool]:
+    """
+    Determine for each of many texts whether it is Japanese.
+    
+    Equivalent to calling is_japanese_text on every text. Texts without any
+    Japanese characters are rejected with a single precompiled search each;
+    joining the texts into one string for a single scan was measured slower,
+    as locating the text of each match costs more than it saves.
+    
+    Args:
+        texts: The texts to analyze
+        min_confidence: Minimum confidence level to consider a text Japanese
+        
+    Returns:
+        List of results, one per input text
+    """
+    search = _JP_CHAR_RE.search
+    return [
+        search(text) is not None and _is_japanese_text_known_contains(text, min_confidence)
+        for text in texts
+    ]
+
+
+def _is_japanese_text_known_contains(text: str, min_confidence: float = 0.5) -> bool:
+    """
+    Determine if a text is Japanese, given that it contains Japanese characters.
+    
+    Callers that have already searched the text for Japanese characters use
+    this to avoid scanning it a second time.
+    
+    Args:
+        text: The text to analyze (must contain at least one Japanese character)
+        min_confidence: Minimum confidence level to consider the text Japanese
+        
+    Returns:
+        True if the text is detected as Japanese, False otherwise
+    """
+    japanese_ratio = _count_japanese_chars(text) / len(text)
+    
     # For very short texts, rely on character detection
     if len(text) < 15:
         # Require a higher density of Japanese characters for short texts
-        japanese_chars = sum(1 for c in text if '\u3040' <= c <= '\u309F' or 
-                                              '\u30A0' <= c <= '\u30FF' or 
-                                              '\u4E00' <= c <= '\u9FAF')
-        return japanese_chars / len(text) > 0.4
+        return japanese_ratio > 0.4
+    
+    # Skip langdetect when the character density is already decisive
+    if japanese_ratio > 0.6:
+        return True
+    if japanese_ratio < 0.05:
+        return False
     
-    # For longer texts, use langdetect
+    # For ambiguous longer texts, use langdetect
+    langdetect = _load_langdetect()
     try:
         # Get language probabilities
         probabilities = langdetect.detect_langs(text)
@@ -78,18 +251,18 @@ def is_japanese_text(text: str, min_confidence: float = 0.5) -> bool:
                 return True
                 
         return False
-    except LangDetectException:
+    except langdetect.LangDetectException:
         # Fallback to character-based detection if langdetect fails
-        japanese_chars = sum(1 for c in text if '\u3040' <= c <= '\u309F' or 
-                                              '\u30A0' <= c <= '\u30FF' or 
-                                              '\u4E00' <= c <= '\u9FAF')
-        return japanese_chars / len(text) > 0.2
+        return japanese_ratio > 0.2
 
 
 def find_japanese_spans(text: str, context_size: int = 50) -> List[JapaneseTextSpan]:
     """
     Find spans of Japanese text in a string with surrounding context.
     
+    A span runs from the first to the last Japanese word of a sentence or
+    line, so surrounding English text and indentation are left out.
+    
     Args:
         text: The text to analyze
         context_size: Number of characters to include as context before and after
@@ -100,38 +273,97 @@ def find_japanese_spans(text: str, context_size: int = 50) -> List[JapaneseTextS
     if not text or not contains_japanese_chars(text):
         return []
     
-    results = []
-    
-    # Split text into sentences or segments
-    segments = re.split(r'([.!?。！？\n]+)', text)
+    return _find_japanese_spans_known_contains(text, context_size)
+
+
+def _find_japanese_spans_known_contains(
+    text: str, context_size: int = 50
+) -> List[JapaneseTextSpan]:
+    """
+    Find spans of Japanese text, given that the text contains Japanese characters.
     
-    current_pos = 0
-    for segment in segments:
-        if not segment:
-            current_pos += len(segment)
-            continue
-            
-        if is_japanese_text(segment):
-            # Get context before
-            start_context = max(0, current_pos - context_size)
-            context_before = text[start_context:current_pos]
-            
-            # Get context after
-            end_pos = current_pos + len(segment)
-            end_context = min(len(text), end_pos + context_size)
-            context_after = text[end_pos:end_context]
+    Args:
+        text: The text to analyze
+        context_size: Number of characters to include as context before and after
+        
+    Returns:
+        List of JapaneseTextSpan objects
+    """
+    # Merge consecutive Japanese words that are not separated by the end of
+    # a sentence or line
+    bounds: List[Tuple[int, int]] = []
+    for match in _JP_WORD_RE.finditer(text):
+        start, end = match.span()
+        if bounds and not _SPAN_BREAK_RE.search(text, bounds[-1][1], start):
+            bounds[-1] = (bounds[-1][0], end)
+        else:
+            bounds.append((start, end))
             
-            results.append(JapaneseTextSpan(
-                text=segment,
-                start_pos=current_pos,
-                end_pos=end_pos,
-                context_before=context_before,
-                context_after=context_after
-            ))
+    # Spans of only punctuation or full-width forms have nothing to translate
+    return [
+        JapaneseTextSpan(text, start_pos, end_pos, context_size)
+        for start_pos, end_pos in bounds
+        if _JP_CHAR_RE.search(text, start_pos, end_pos)
+    ]
+
+
+def find_japanese_spans_many(
+    texts: List[str], context_size: int = 50
+) -> List[List[JapaneseTextSpan]]:
+    """
+    Find spans of Japanese text in many strings at once.
+    
+    Texts without any Japanese characters are rejected up front, so only the
+    remaining ones are scanned for spans.
+    
+    Args:
+        texts: The texts to analyze
+        context_size: Number of characters to include as context before and after
+        
+    Returns:
+        List of JapaneseTextSpan lists, one per input text
+    """
+    search = _JP_CHAR_RE.search
+    return [
+        _find_japanese_spans_known_contains(text, context_size) if search(text) else []
+        for text in texts
+    ]
+
+
+def collect_translation_batch(
+    file_spans: List[JapaneseTextSpan], max_chars: int = 3000
+) -> List[List[JapaneseTextSpan]]:
+    """
+    Group spans into batches that can be translated with a single request.
+    
+    Spans keep their order. A batch is closed once adding the next span would
+    exceed max_chars characters of text; a span longer than max_chars gets a
+    batch of its own.
+    
+    Args:
+        file_spans: Spans to group, typically all spans found in one file
+        max_chars: Maximum total text length of a batch
         
-        current_pos += len(segment)
+    Returns:
+        List of span batches
+    """
+    batches: List[List[JapaneseTextSpan]] = []
+    current: List[JapaneseTextSpan] = []
+    current_chars = 0
     
-    return results
+    for span in file_spans:
+        span_chars = span.end_pos - span.start_pos
+        if current and current_chars + span_chars > max_chars:
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(span)
+        current_chars += span_chars
+        
+    if current:
+        batches.append(current)
+        
+    return batches
 
 
 def extract_japanese_text_with_context(text: str) -> List[Tuple[str, str, str]]:
@@ -146,3 +378,21 @@ def extract_japanese_text_with_context(text: str) -> List[Tuple[str, str, str]]:
     """
     spans = find_japanese_spans(text)
     return [(span.context_before, span.text, span.context_after) for span in spans]
+
+
+def extract_japanese_text_with_context_batch(
+    texts: List[str]
+) -> List[List[Tuple[str, str, str]]]:
+    """
+    Extract Japanese text segments with their surrounding context from many texts.
+    
+    Args:
+        texts: The texts to analyze
+        
+    Returns:
+        List of (context_before, japanese_text, context_after) lists, one per input text
+    """
+    return [
+        [(span.context_before, span.text, span.context_after) for span in spans]
+        for spans in find_japanese_spans_many(texts)
+    ]
@@ -5,14 +5,11 @@ This module provides functions to format and display translation results,
 including before/after diffs and summary information.
 """
 
-import difflib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.syntax import Syntax
 from rich.table import Table
 from rich.text import Text
 
@@ -39,28 +36,45 @@ class DiffFormatter:
         Args:
             result: Translation result to display
         """
+        self.display_translation_results([result])
+    
+    def display_translation_results(self, results: List[TranslationResult]) -> None:
+        """
+        Display translation results as a single table.
+        
+        Rendering one table for all results is much cheaper than printing a
+        table per result. Context columns are added if any result has context.
+        
+        Args:
+            results: Translation results to display
+        """
+        if not results:
+            return
+            
+        show_context = any(r.context_before or r.context_after for r in results)
+        
         # Create a table to show original and translated text
-        table = Table(title="Translation Result", show_header=True, header_style="bold")
+        title = "Translation Result" if len(results) == 1 else "Translation Results"
+        table = Table(title=title, show_header=True, header_style="bold")
         table.add_column("Original (Japanese)", style="yellow")
         table.add_column("Translated (English)", style="green")
         
-        table.add_row(result.original_text, result.translated_text)
-        
-        self.console.print(table)
-        
-        # Show context if available
-        if result.context_before or result.context_after:
-            context_table = Table(title="Context", show_header=True, header_style="bold")
-            context_table.add_column("Position")
-            context_table.add_column("Text")
+        if show_context:
+            table.add_column("Context Before")
+            table.add_column("Context After")
             
-            if result.context_before:
-                context_table.add_row("Before", Text(result.context_before, style="dim"))
-                
-            if result.context_after:
-                context_table.add_row("After", Text(result.context_after, style="dim"))
+        for result in results:
+            if show_context:
+                table.add_row(
+                    result.original_text,
+                    result.translated_text,
+                    Text(result.context_before, style="dim"),
+                    Text(result.context_after, style="dim")
+                )
+            else:
+                table.add_row(result.original_text, result.translated_text)
                 
-            self.console.print(context_table)
+        self.console.print(table)
     
     def display_file_diff(
         self,
@@ -78,32 +92,56 @@ class DiffFormatter:
             updated_content: Updated file content with translations
             syntax_highlighting: Whether to use syntax highlighting
         """
+        # Deferred imports: only needed when a diff is actually shown
+        import difflib
+        
         self.console.print(Panel(f"[bold blue]File: {file_path}[/]"))
         
         # Get file extension for syntax highlighting
         extension = file_path.suffix.lstrip('.')
         
-        # Generate unified diff
-        diff = list(difflib.unified_diff(
+        # Generate unified diff lazily
+        diff = difflib.unified_diff(
             original_content.splitlines(),
             updated_content.splitlines(),
             fromfile=f"original/{file_path.name}",
             tofile=f"translated/{file_path.name}",
             lineterm=''
-        ))
-        
-        if diff:
-            # Join diff lines into a single string
-            diff_text = '\n'.join(diff)
+        )
+        
+        # Print the diff one hunk at a time, so the full diff text is never
+        # built or rendered as a single document
+        hunk: List[str] = []
+        seen_hunk = False
+        for line in diff:
+            if line.startswith('@@'):
+                # Flush the previous hunk; the file header stays with the first one
+                if seen_hunk:
+                    self._print_diff_text('\n'.join(hunk), syntax_highlighting)
+                    hunk = []
+                seen_hunk = True
+            hunk.append(line)
             
-            # Display diff with syntax highlighting if requested
-            if syntax_highlighting:
-                self.console.print(Syntax(diff_text, "diff", theme="monokai"))
-            else:
-                self.console.print(diff_text)
+        if hunk:
+            self._print_diff_text('\n'.join(hunk), syntax_highlighting)
         else:
             self.console.print("[yellow]No changes made to the file.[/]")
     
+    def _print_diff_text(self, diff_text: str, syntax_highlighting: bool) -> None:
+        """
+        Print a chunk of unified diff output.
+        
+        Args:
+            diff_text: Diff lines joined with newlines
+            syntax_highlighting: Whether to use syntax highlighting
+        """
+        if syntax_highlighting:
+            from rich.syntax import Syntax
+            
+            self.console.print(Syntax(diff_text, "diff", theme="monokai"))
+        else:
+            self.console.print(diff_text)
+    
     def display_translation_summary(
         self,
         processed_files: int,
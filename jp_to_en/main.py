@@ -16,8 +16,9 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 # パッケージからのインポート
-from jp_to_en.processor import Processor
+# (Processor is imported in main() so that --help does not load the translator stack)
 from jp_to_en.config_manager import ConfigManager
+from jp_to_en.parser.parser_factory import ParserFactory
 
 
 # Configure logging
@@ -29,6 +30,9 @@ logging.basicConfig(
 logger = logging.getLogger("jp-to-en")
 console = Console()
 
+# Directory names that are never descended into when searching for files
+_SKIPPED_DIR_NAMES = {".git", "node_modules", "__pycache__", ".venv"}
+
 
 def setup_argparser() -> argparse.ArgumentParser:
     """Set up and return the argument parser for CLI options."""
@@ -85,6 +89,13 @@ def setup_argparser() -> argparse.ArgumentParser:
         help="Save the provided API key for future use",
     )
     
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="Number of worker processes for parsing and Japanese detection "
+             "(default: processor.parallel_processes from the configuration)",
+    )
+    
     parser.add_argument(
         "--config", "-c",
         type=str,
@@ -98,6 +109,9 @@ def find_files(paths: List[str], recursive: bool = False) -> List[Path]:
     """
     Find all files to process based on the given paths.
     
+    Files found inside directories are only returned if a parser supports
+    their extension. Explicitly listed files are always returned.
+    
     Args:
         paths: List of file or directory paths to process
         recursive: Whether to search directories recursively
@@ -106,6 +120,7 @@ def find_files(paths: List[str], recursive: bool = False) -> List[Path]:
         List of Path objects for files to process
     """
     result = []
+    extensions = set(ParserFactory.get_supported_extensions())
     
     for path_str in paths:
         path = Path(path_str)
@@ -117,14 +132,24 @@ def find_files(paths: List[str], recursive: bool = False) -> List[Path]:
         if path.is_file():
             result.append(path)
         elif path.is_dir():
-            if recursive:
-                for file_path in path.glob("**/*"):
-                    if file_path.is_file():
-                        result.append(file_path)
-            else:
-                for file_path in path.glob("*"):
-                    if file_path.is_file():
-                        result.append(file_path)
+            # Walk with os.scandir: DirEntry caches the file type, so no extra
+            # stat call is needed per entry
+            stack = [str(path)]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                if os.path.splitext(entry.name)[1].lower() in extensions:
+                                    result.append(Path(entry.path))
+                            elif (recursive and entry.name not in _SKIPPED_DIR_NAMES
+                                  and entry.is_dir(follow_symlinks=False)):
+                                stack.append(entry.path)
+                except OSError as e:
+                    # Skip unreadable directories and ones removed while walking
+                    logger.warning(f"Cannot read directory {directory}: {e}")
+                    continue
     
     return result
 
@@ -147,7 +172,7 @@ def main() -> int:
         logger.setLevel(logging.ERROR)
     
     # Initialize config manager
-    config_manager = ConfigManager()
+    config_manager = ConfigManager.get_default()
     
     # Get API key with priority: args > environment > saved
     api_key = args.api_key or os.environ.get("OPENAI_API_KEY") or config_manager.get_api_key()
@@ -190,12 +215,19 @@ def main() -> int:
         logger.info(f"Found {len(files)} file(s) to process (use -r for recursive)")
     
     # Process files
+    from jp_to_en.processor import Processor
+    
+    jobs = args.jobs or config_manager.get_config_value("processor.parallel_processes", 1)
+    concurrency = config_manager.get_config_value("processor.concurrency", 8)
+    
     processor = Processor(
         api_key=api_key,
         output_dir=args.output_dir,
         dry_run=args.dry_run,
         verbose=args.verbose,
-        console=console
+        console=console,
+        jobs=jobs,
+        concurrency=concurrency
     )
     
     summary = processor.process_files(files)
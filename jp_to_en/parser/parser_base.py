@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import List, Protocol, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CodeComment:
     """Represents a comment extracted from source code."""
     content: str  # The text content of the comment
@@ -17,6 +17,8 @@ class CodeComment:
     column: int  # The column where the comment starts
     is_multiline: bool  # Whether this is a multi-line comment
     file_path: Optional[Path] = None  # The source file path
+    start_offset: Optional[int] = None  # Offset of the content in the source text
+    end_offset: Optional[int] = None  # Offset just past the content in the source text
     
     @property
     def is_block_comment(self) -> bool:
@@ -24,8 +26,36 @@ class CodeComment:
         return self.is_multiline
 
 
+def line_offsets(content: str) -> List[int]:
+    """
+    Compute the offset at which each line of the source text starts.
+    
+    Lines are split on newline characters only, the same way Python's
+    tokenizer reads them.
+    
+    Args:
+        content: Source text
+        
+    Returns:
+        Offsets indexed by zero-based line number
+    """
+    # A plain list: the table only lives for one parse and is read a lot
+    offsets = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
+
 class SourceCodeParser(Protocol):
-    """Protocol defining the interface for source code parsers."""
+    """
+    Protocol defining the interface for source code parsers.
+    
+    A single parser instance is reused for every file with a matching
+    extension, so implementations must not keep per-file state between
+    parse_file/parse_string calls.
+    """
     
     def parse_file(self, file_path: Path) -> List[CodeComment]:
         """
@@ -3,85 +3,89 @@ Parser factory module for selecting the appropriate parser based on file extensi
 """
 
 import importlib
-import inspect
-import pkgutil
 from pathlib import Path
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Type, cast
 
 # パッケージからのインポート
 from jp_to_en.parser.parser_base import SourceCodeParser
 
 
+# Built-in parser modules within the jp_to_en.parser package, by file extension.
+# Each module names its parser class in a module-level PARSER_CLASS_NAME, and is
+# only imported the first time one of its extensions is used.
+_BUILTIN_PARSERS: Dict[str, str] = {
+    ".py": "python_parser",
+    ".pyi": "python_parser",
+}
+
+
 class ParserFactory:
     """Factory for creating language-specific source code parsers."""
     
     _parsers: Dict[str, Type[SourceCodeParser]] = {}
-    _initialized = False
+    _instance_cache: Dict[str, SourceCodeParser] = {}
     
     @classmethod
-    def initialize(cls) -> None:
+    def _get_parser_class(cls, extension: str) -> Optional[Type[SourceCodeParser]]:
         """
-        Initialize the parser factory by discovering all available parsers.
+        Resolve the parser class for a file extension, importing it if needed.
+        
+        Args:
+            extension: Lower-cased file extension (e.g., '.py')
+            
+        Returns:
+            The parser class, or None if no parser is available
         """
-        if cls._initialized:
-            return
+        parser_class = cls._parsers.get(extension)
+        if parser_class is not None:
+            return parser_class
             
-        # Import all modules in the parser package
-        import jp_to_en.parser as parser_pkg
-        package_prefix = "jp_to_en.parser"
-        
-        for _, modname, _ in pkgutil.iter_modules(parser_pkg.__path__):
-            if modname == "parser_base" or modname == "parser_factory":
-                continue
-                
-            module = importlib.import_module(f"{package_prefix}.{modname}")
+        module_name = _BUILTIN_PARSERS.get(extension)
+        if module_name is None:
+            return None
             
-            # Find parser classes in the module
-            for name, obj in inspect.getmembers(module):
-                if (inspect.isclass(obj) and 
-                    hasattr(obj, "get_supported_extensions") and
-                    callable(getattr(obj, "get_supported_extensions"))):
-                    
-                    # Register the parser with its supported extensions
-                    for ext in obj.get_supported_extensions():
-                        cls._parsers[ext] = obj
-        
-        cls._initialized = True
+        module = importlib.import_module(f"jp_to_en.parser.{module_name}")
+        parser_class = cast(Type[SourceCodeParser], getattr(module, module.PARSER_CLASS_NAME))
+        cls._parsers[extension] = parser_class
+        return parser_class
     
     @classmethod
     def get_parser_for_file(cls, file_path: Path) -> Optional[SourceCodeParser]:
         """
         Get the appropriate parser for a given file.
         
+        Parser instances are shared between all files with the same extension.
+        
         Args:
             file_path: Path to the source code file
             
         Returns:
             An instance of the appropriate parser, or None if no parser is available
         """
-        if not cls._initialized:
-            cls.initialize()
-            
         ext = file_path.suffix.lower()
-        parser_class = cls._parsers.get(ext)
-        
-        if parser_class:
-            return parser_class()
-        
-        return None
+        parser = cls._instance_cache.get(ext)
+        if parser is not None:
+            return parser
+            
+        parser_class = cls._get_parser_class(ext)
+        if parser_class is None:
+            return None
+            
+        parser = parser_class()
+        cls._instance_cache[ext] = parser
+        return parser
     
     @classmethod
     def get_supported_extensions(cls) -> List[str]:
         """
         Get all file extensions supported by the registered parsers.
         
+        This does not import any parser modules.
+        
         Returns:
             List of supported file extensions
         """
-        if not cls._initialized:
-            cls.initialize()
-            
-        return list(cls._parsers.keys())
+        return list(dict.fromkeys([*_BUILTIN_PARSERS, *cls._parsers]))
     
     @classmethod
     def register_parser(cls, extension: str, parser_class: Type[SourceCodeParser]) -> None:
@@ -92,7 +96,6 @@ class ParserFactory:
             extension: File extension (e.g., '.py')
             parser_class: Parser class to register
         """
-        if not cls._initialized:
-            cls.initialize()
-            
-        cls._parsers[extension.lower()] = parser_class
+        extension = extension.lower()
+        cls._parsers[extension] = parser_class
+        cls._instance_cache.pop(extension, None)
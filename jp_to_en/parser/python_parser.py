@@ -4,16 +4,228 @@ Python source code parser for extracting comments.
 This module provides a parser for extracting comments from Python source code files.
 """
 
+import ast
+import bisect
+import io
+import os
 import re
+import sys
+import tokenize
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple, Type, cast
 
 try:
     # パッケージとしてインストール時
-    from jp_to_en.parser.parser_base import CodeComment
+    from jp_to_en.parser.parser_base import CodeComment, line_offsets
 except ImportError:
     # 開発環境での実行時
-    from src.parser.parser_base import CodeComment
+    from src.parser.parser_base import CodeComment, line_offsets
+
+# Parser class looked up by ParserFactory
+PARSER_CLASS_NAME = "PythonParser"
+
+# Nodes whose first statement may be a docstring
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# String literals and "#" comments of valid Python source. Strings are
+# matched only so that a "#" inside them is skipped; their prefixes do not
+# change where they end.
+_TOKEN_RE = re.compile(r'''
+    (?P<string>
+        """(?:\\[\s\S]|[^\\])*?"""
+      | \'\'\'(?:\\[\s\S]|[^\\])*?\'\'\'
+      | "(?:\\[\s\S]|[^"\\\n])*"
+      | \'(?:\\[\s\S]|[^\'\\\n])*\'
+    )
+  | (?P<comment>\#[^\n]*)
+''', re.VERBOSE)
+
+# Start of an f-string literal. From Python 3.12 (PEP 701) a replacement
+# field may reuse the enclosing quotes, which _TOKEN_RE cannot follow.
+_FSTRING_START_RE = re.compile(r'(?<!\w)(?:[fF][rR]?|[rR][fF])[\'"]')
+
+# Comments up to this length are interned; short boilerplate such as
+# "TODO" or "noqa" recurs throughout a project
+_INTERN_MAX_LEN = 64
+
+
+def _char_column(content: str, line_start: int, byte_col: int) -> int:
+    """
+    Convert a UTF-8 byte column reported by the AST into a character column.
+    
+    Args:
+        content: Source text
+        line_start: Offset of the start of the line in the source text
+        byte_col: Column in UTF-8 bytes
+        
+    Returns:
+        Column in characters
+    """
+    # A line prefix of byte_col bytes has at most byte_col characters
+    prefix = content[line_start:line_start + byte_col]
+    if prefix.isascii():
+        return byte_col
+    return len(prefix.encode('utf-8')[:byte_col].decode('utf-8'))
+
+
+def _comment_text(comment: str) -> str:
+    """
+    Get the text of a "#" comment, excluding the "#" character.
+    
+    Short ASCII comments are interned, so repeated ones share a single string
+    and compare equal by identity in later lookups.
+    
+    Args:
+        comment: The comment including the "#" character
+        
+    Returns:
+        The comment text
+    """
+    text = comment[1:].lstrip()
+    if len(text) < _INTERN_MAX_LEN and text.isascii():
+        return sys.intern(text)
+    return text
+
+
+def _extract_docstrings(
+    tree: ast.AST, content: str, line_starts: List[int], file_path: Optional[Path]
+) -> List[CodeComment]:
+    """
+    Extract the docstrings of a module and its classes and functions.
+    
+    The docstring text is taken from the source between the quotes, so it
+    is exactly the text the offsets point at (escape sequences are kept).
+    
+    Args:
+        tree: AST of the source
+        content: Python source code as a string
+        line_starts: Line start offsets of the source
+        file_path: Source file path, if any
+        
+    Returns:
+        List of docstrings, in no particular order
+    """
+    docstrings = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _DOCSTRING_OWNERS) or not node.body:
+            continue
+        first = node.body[0]
+        if not (
+            isinstance(first, ast.Expr)
+            and isinstance(first.value, ast.Constant)
+            and isinstance(first.value.value, str)
+        ):
+            continue
+            
+        value = first.value
+        if value.end_lineno is None or value.end_col_offset is None:
+            # Only nodes built by hand lack end positions
+            continue
+        line_num = value.lineno
+        start_line = line_starts[line_num - 1]
+        end_line = line_starts[value.end_lineno - 1]
+        col = _char_column(content, start_line, value.col_offset)
+        end_col = _char_column(content, end_line, value.end_col_offset)
+        
+        # Skip string prefixes such as r or u, then the quotes
+        literal = content[start_line + col:end_line + end_col]
+        prefix_len = len(literal) - len(literal.lstrip('rRbBuUfF'))
+        quote_len = 3 if literal[prefix_len:prefix_len + 3] in ('"""', "'''") else 1
+        start_offset = start_line + col + prefix_len + quote_len
+        end_offset = end_line + end_col - quote_len
+        docstring_text = content[start_offset:end_offset]
+        
+        docstrings.append(CodeComment(
+            content=docstring_text,
+            line_number=line_num,
+            column=col,
+            is_multiline='\n' in docstring_text,
+            file_path=file_path,
+            start_offset=start_offset,
+            end_offset=end_offset
+        ))
+    return docstrings
+
+
+def _scan_comments(
+    content: str, line_starts: List[int], file_path: Optional[Path]
+) -> List[CodeComment]:
+    """
+    Extract the "#" comments of valid Python source with a single regex scan.
+    
+    Args:
+        content: Python source code as a string
+        line_starts: Line start offsets of the source
+        file_path: Source file path, if any
+        
+    Returns:
+        List of comments, in source order
+    """
+    comments = []
+    for match in _TOKEN_RE.finditer(content):
+        comment = match.group('comment')
+        if comment is None:
+            continue
+            
+        # Look the line up in the line start table instead of counting the
+        # newlines before the comment
+        start = match.start()
+        line_num = bisect.bisect_right(line_starts, start)
+        
+        comment_text = _comment_text(comment)
+        end_offset = match.end()
+        comments.append(CodeComment(
+            content=comment_text,
+            line_number=line_num,
+            column=start - line_starts[line_num - 1],
+            is_multiline=False,
+            file_path=file_path,
+            start_offset=end_offset - len(comment_text),
+            end_offset=end_offset
+        ))
+    return comments
+
+
+def _tokenize_comments(
+    content: str, line_starts: List[int], file_path: Optional[Path]
+) -> List[CodeComment]:
+    """
+    Extract the "#" comments of possibly invalid Python source.
+    
+    The tokenizer is slower than _scan_comments, but it stops cleanly at the
+    point where the source becomes invalid.
+    
+    Args:
+        content: Python source code as a string
+        line_starts: Line start offsets of the source
+        file_path: Source file path, if any
+        
+    Returns:
+        List of comments found before any tokenize error, in source order
+    """
+    comments = []
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(content).readline):
+            if tok.type == tokenize.COMMENT:
+                line_num, col = tok.start
+                comment_text = _comment_text(tok.string)
+                end_offset = line_starts[line_num - 1] + col + len(tok.string)
+                comments.append(CodeComment(
+                    content=comment_text,
+                    line_number=line_num,
+                    column=col,
+                    is_multiline=False,
+                    file_path=file_path,
+                    start_offset=end_offset - len(comment_text),
+                    end_offset=end_offset
+                ))
+    except (tokenize.TokenError, SyntaxError):
+        # Keep the comments found before the point where the source is invalid
+        pass
+    return comments
 
 
 class PythonParser:
@@ -33,129 +245,128 @@ class PythonParser:
         """
         Parse a Python source file and extract all comments.
         
+        Results are cached per parser class, file path, modification time
+        and size.
+        
         Args:
             file_path: Path to the Python source file
             
         Returns:
             List of extracted comments
         """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return self.parse_string(content, str(file_path))
-        except UnicodeDecodeError:
-            # Try with alternative encoding
-            with open(file_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-            return self.parse_string(content, str(file_path))
+        # Files that have not changed since they were last parsed are served
+        # from the cache; classes hash by identity, which typeshed does not
+        # express for type[PythonParser]
+        st = file_path.stat()
+        return list(_parse_file_cached(
+            cast(Hashable, type(self)), str(file_path), st.st_mtime_ns, st.st_size
+        ))
     
-    def parse_string(self, content: str, filename: Optional[str] = None) -> List[CodeComment]:
+    def parse_paths(
+        self, paths: List[Path], workers: Optional[int] = None
+    ) -> Dict[Path, List[CodeComment]]:
         """
-        Parse Python source code from a string and extract all comments.
+        Parse many Python source files, in worker processes.
+        
+        Paths listed more than once are parsed once.
         
         Args:
-            content: Python source code as a string
-            filename: Optional filename for reference
+            paths: Paths to the Python source files
+            workers: Number of worker processes (defaults to the CPU count)
             
         Returns:
-            List of extracted comments
+            Extracted comments by file path, in the order of first occurrence
         """
-        file_path = Path(filename) if filename else None
-        comments = []
-        
-        # Find all comments and docstrings
-        line_comments = self._extract_line_comments(content)
-        docstrings = self._extract_docstrings(content)
-        
-        # Process line comments
-        for line_num, col, comment_text in line_comments:
-            comments.append(CodeComment(
-                content=comment_text,
-                line_number=line_num,
-                column=col,
-                is_multiline=False,
-                file_path=file_path
-            ))
-        
-        # Process docstrings
-        for line_num, col, docstring_text, is_multiline in docstrings:
-            comments.append(CodeComment(
-                content=docstring_text,
-                line_number=line_num,
-                column=col,
-                is_multiline=is_multiline,
-                file_path=file_path
+        paths = list(dict.fromkeys(paths))
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(paths) < 2:
+            return {path: self.parse_file(path) for path in paths}
+            
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(
+                paths, executor.map(
+                    partial(_parse_one, type(self)), map(str, paths), chunksize=chunksize
+                )
             ))
-        
-        # Sort comments by line number
-        comments.sort(key=lambda c: (c.line_number, c.column))
-        
-        return comments
     
-    def _extract_line_comments(self, content: str) -> List[Tuple[int, int, str]]:
+    def parse_string(self, content: str, filename: Optional[str] = None) -> List[CodeComment]:
         """
-        Extract all line comments (# comments) from Python code.
+        Parse Python source code from a string and extract all comments.
         
         Args:
-            content: Python source code
+            content: Python source code as a string
+            filename: Optional filename for reference
             
         Returns:
-            List of tuples (line_number, column, comment_text)
-        """
-        results = []
-        lines = content.split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
-            # Find the start of the comment
-            comment_match = re.search(r'(^|\s)#\s*(.*?)$', line)
-            if comment_match:
-                # Calculate the column position
-                col = comment_match.start()
-                
-                # Extract the comment text (excluding the # character)
-                comment_text = comment_match.group(2)
-                
-                results.append((line_num, col, comment_text))
-        
-        return results
-    
-    def _extract_docstrings(self, content: str) -> List[Tuple[int, int, str, bool]]:
+            List of extracted comments
         """
-        Extract all docstrings from Python code.
+        file_path = Path(filename) if filename else None
+        line_starts = line_offsets(content)
         
-        Args:
-            content: Python source code
+        try:
+            # Compiling reports invalid escape sequences and similar problems
+            # of the scanned code as warnings, which are not ours to show
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', SyntaxWarning)
+                warnings.simplefilter('ignore', DeprecationWarning)
+                tree = ast.parse(content, filename=filename or '<unknown>')
+        except (SyntaxError, ValueError):
+            # Without a valid AST there are no docstrings, and the regex scan
+            # cannot be trusted to tell strings from comments
+            return _tokenize_comments(content, line_starts, file_path)
             
-        Returns:
-            List of tuples (line_number, column, docstring_text, is_multiline)
-        """
-        results = []
+        comments = _extract_docstrings(tree, content, line_starts, file_path)
+        if sys.version_info >= (3, 12) and _FSTRING_START_RE.search(content):
+            # The source may nest quotes in f-strings, e.g. f"{d["#"]}", where
+            # the regex scan would take the "#" for a comment
+            comments.extend(_tokenize_comments(content, line_starts, file_path))
+        else:
+            comments.extend(_scan_comments(content, line_starts, file_path))
         
-        # Handle triple-quoted docstrings (both """ and ''')
-        # We use a regex pattern that captures the docstring delimiter and content
-        docstring_pattern = re.compile(r'("""|\'\'\')(.*?)\1|'
-                                       r'("""|\'\'\')(.*?)(?:\1|$)',
-                                       re.DOTALL)
+        # Merge docstrings and comments into source order; every comment
+        # found above has offsets
+        comments.sort(key=lambda c: c.start_offset or 0)
+        return comments
+
+
+@lru_cache(maxsize=4096)
+def _parse_file_cached(
+    parser_cls: Type[PythonParser], path: str, mtime_ns: int, size: int
+) -> Tuple[CodeComment, ...]:
+    """
+    Read a Python source file and parse it with parse_string of parser_cls.
+    
+    The modification time and size are not read here; they are part of the
+    cache key so that a changed file is parsed again.
+    
+    Args:
+        parser_cls: Parser class whose parse_string is used
+        path: Path to the Python source file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
         
-        for match in docstring_pattern.finditer(content):
-            # The docstring content is either in group 2 or 4
-            docstring_text = match.group(2) or match.group(4) or ''
-            
-            # Calculate line number and column
-            start_pos = match.start()
-            preceding_text = content[:start_pos]
-            line_num = preceding_text.count('\n') + 1
-            
-            # Calculate column position
-            last_newline = preceding_text.rfind('\n')
-            if last_newline == -1:
-                col = start_pos
-            else:
-                col = start_pos - last_newline - 1
-            
-            # Determine if it's multiline
-            is_multiline = '\n' in docstring_text
-            
-            results.append((line_num, col, docstring_text, is_multiline))
+    Returns:
+        Tuple of extracted comments
+    """
+    # Read the file in one go and detect the encoding (PEP 263 declaration or
+    # UTF-8 BOM) from the bytes in memory, instead of letting tokenize.open
+    # probe the file and then read it again through a text wrapper
+    data = Path(path).read_bytes()
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    content = data.decode(encoding).replace('\r\n', '\n').replace('\r', '\n')
+    return tuple(parser_cls().parse_string(content, path))
+
+
+def _parse_one(parser_cls: Type[PythonParser], path: str) -> List[CodeComment]:
+    """
+    Parse a single Python source file in a worker process.
+    
+    Args:
+        parser_cls: Parser class to parse the file with
+        path: Path to the Python source file
         
-        return results
+    Returns:
+        List of extracted comments
+    """
+    return parser_cls().parse_file(Path(path))
@@ -7,16 +7,27 @@ and formatters to process files and translate Japanese comments to English.
 
 import logging
 import os
-from dataclasses import dataclass
+import stat
+import tempfile
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterator, List, Optional, Tuple, Set
 
 from rich.console import Console
 from rich.progress import Progress
 
 # パッケージからのインポート
-from jp_to_en.detector.japanese_detector import extract_japanese_text_with_context
-from jp_to_en.parser.parser_base import CodeComment
+from jp_to_en.detector.japanese_detector import (
+    JapaneseTextSpan,
+    collect_translation_batch,
+    contains_japanese_bytes,
+    find_japanese_spans_many
+)
+from jp_to_en.parser.parser_base import CodeComment, line_offsets
 from jp_to_en.parser.parser_factory import ParserFactory
 from jp_to_en.translator.openai_translator import OpenAITranslator, TranslationResult
 from jp_to_en.formatter.diff_formatter import DiffFormatter
@@ -25,31 +36,97 @@ from jp_to_en.formatter.diff_formatter import DiffFormatter
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Results of processing a single file."""
     file_path: Path
+    # Comments parsed from the file; files without any Japanese lead byte
+    # are not parsed, so this stays 0 for them
     comments_found: int = 0
     japanese_comments_found: int = 0
     comments_translated: int = 0
     has_changes: bool = False
     original_content: str = ""
     updated_content: str = ""
+    # (comment, translation) pairs, previewed once the file is done
+    translations: List[Tuple[CodeComment, TranslationResult]] = field(default_factory=list)
     error: Optional[Exception] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingSummary:
     """Summary of a batch processing operation."""
     processed_files: int = 0
     translated_files: int = 0
-    total_comments: int = 0
+    total_comments: int = 0  # Sum of ProcessingResult.comments_found
     japanese_comments: int = 0
     translated_comments: int = 0
     error_files: int = 0
     skipped_files: int = 0
 
 
+@dataclass(slots=True)
+class FileAnalysis:
+    """Comments and Japanese text found in a single file, before translation."""
+    file_path: Path
+    exists: bool = True
+    has_parser: bool = True
+    content: str = ""
+    comments: List[CodeComment] = field(default_factory=list)
+    comment_spans: List[List[JapaneseTextSpan]] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
+def analyze_file(file_path: Path) -> FileAnalysis:
+    """
+    Read a file, extract its comments and detect Japanese text in them.
+    
+    This step does not touch the translator or the console, so it can run
+    in a worker process.
+    
+    Args:
+        file_path: Path to the file to analyze
+        
+    Returns:
+        File analysis
+    """
+    analysis = FileAnalysis(file_path=file_path)
+    
+    # Check if file exists
+    if not file_path.exists() or not file_path.is_file():
+        analysis.exists = False
+        return analysis
+        
+    # Get parser for file
+    parser = ParserFactory.get_parser_for_file(file_path)
+    if not parser:
+        analysis.has_parser = False
+        return analysis
+        
+    try:
+        # Files without any Japanese lead byte cannot need translation, so
+        # they are not decoded or parsed at all
+        raw = file_path.read_bytes()
+        if not contains_japanese_bytes(raw):
+            # Left with no comments, so comments_found is 0 for the file
+            return analysis
+            
+        # Decode with universal newlines, as text mode reading would
+        analysis.content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            
+        # Parse the content already read instead of reading the file again
+        analysis.comments = parser.parse_string(analysis.content, str(file_path))
+        
+        # Detect Japanese text in all comments of the file in one call
+        analysis.comment_spans = find_japanese_spans_many(
+            [c.content for c in analysis.comments]
+        )
+    except Exception as e:
+        analysis.error = e
+        
+    return analysis
+
+
 class Processor:
     """Main processor for translating Japanese comments to English."""
     
@@ -59,7 +136,9 @@ class Processor:
         output_dir: Optional[str] = None,
         dry_run: bool = False,
         verbose: bool = False,
-        console: Optional[Console] = None
+        console: Optional[Console] = None,
+        jobs: int = 1,
+        concurrency: int = 8
     ):
         """
         Initialize the processor.
@@ -70,20 +149,24 @@ class Processor:
             dry_run: Show changes without modifying files
             verbose: Enable verbose output
             console: Rich console for output
+            jobs: Number of worker processes used for parsing and detection
+            concurrency: Number of files translated at the same time
         """
         self.api_key = api_key
         self.output_dir = Path(output_dir) if output_dir else None
         self.dry_run = dry_run
         self.verbose = verbose
         self.console = console or Console()
+        self.jobs = max(1, jobs)
+        self.concurrency = max(1, concurrency)
+        
+        # Output directories known to exist, so each is created only once
+        self._created_dirs: Set[Path] = set()
         
         # Initialize components
         self.translator = OpenAITranslator(api_key=api_key)
         self.formatter = DiffFormatter(console=self.console)
         
-        # Initialize parser factory
-        ParserFactory.initialize()
-        
         # Create output directory if necessary
         if self.output_dir and not self.output_dir.exists():
             self.output_dir.mkdir(parents=True)
@@ -103,27 +186,27 @@ class Processor:
         with Progress() as progress:
             task = progress.add_task("[green]Processing files...", total=len(file_paths))
             
-            for file_path in file_paths:
-                try:
-                    result = self.process_file(file_path)
-                    
-                    # Update summary
-                    summary.processed_files += 1
-                    summary.total_comments += result.comments_found
-                    summary.japanese_comments += result.japanese_comments_found
-                    summary.translated_comments += result.comments_translated
-                    
-                    if result.has_changes:
-                        summary.translated_files += 1
-                        
-                    if result.error:
-                        summary.error_files += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {e}")
-                    summary.error_files += 1
+            # Translation is bound by API latency, so files are translated on
+            # threads; only this loop updates the summary. Files are submitted
+            # as they are analyzed, with a bounded number in flight, so their
+            # contents are not all held in memory at once.
+            max_in_flight = self.concurrency * 2
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures: Dict[Future, Path] = {}
                 
-                progress.update(task, advance=1)
+                for analysis in self._analyze_files(file_paths):
+                    if len(futures) >= max_in_flight:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._record_result(summary, futures.pop(future), future)
+                            progress.update(task, advance=1)
+                    futures[executor.submit(self._process_analysis, analysis)] = (
+                        analysis.file_path
+                    )
+                
+                for future in as_completed(futures):
+                    self._record_result(summary, futures[future], future)
+                    progress.update(task, advance=1)
         
         # Display summary
         self.formatter.display_translation_summary(
@@ -136,6 +219,88 @@ class Processor:
         
         return summary
     
+    def _record_result(
+        self, summary: ProcessingSummary, file_path: Path, future: Future
+    ) -> None:
+        """
+        Add the result of a finished file to the summary.
+        
+        Args:
+            summary: Summary to update
+            file_path: Path of the processed file
+            future: Finished future of _process_analysis
+        """
+        try:
+            result = future.result()
+            self._display_changes(result)
+            
+            # Update summary
+            summary.processed_files += 1
+            summary.total_comments += result.comments_found
+            summary.japanese_comments += result.japanese_comments_found
+            summary.translated_comments += result.comments_translated
+            
+            if result.has_changes:
+                summary.translated_files += 1
+                
+            if result.error:
+                summary.error_files += 1
+                
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            summary.error_files += 1
+    
+    def _display_changes(self, result: ProcessingResult) -> None:
+        """
+        Preview the translations of a processed file and show its diff.
+        
+        Called on the thread that collects the results, so the output of
+        files translated at the same time is not interleaved.
+        
+        Args:
+            result: Processing result of the file
+        """
+        if not result.translations:
+            return
+            
+        # Preview changes
+        if self.verbose or self.dry_run:
+            self.formatter.preview_file_changes(result.file_path, result.translations)
+            
+        # Show diff of the written changes
+        if self.verbose and not self.dry_run and result.error is None:
+            self.formatter.display_file_diff(
+                result.file_path, result.original_content, result.updated_content
+            )
+    
+    def _analyze_files(self, file_paths: List[Path]) -> Iterator[FileAnalysis]:
+        """
+        Analyze files in order, in worker processes when jobs > 1.
+        
+        Args:
+            file_paths: List of file paths to analyze
+            
+        Yields:
+            File analyses, in the order of file_paths
+        """
+        if self.jobs == 1 or len(file_paths) < 2:
+            for file_path in file_paths:
+                yield analyze_file(file_path)
+            return
+            
+        # Keep a bounded window of analyses submitted ahead instead of
+        # executor.map, which would buffer every finished analysis until the
+        # caller gets to it
+        window = self.jobs * 4
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            submitted: "deque[Future]" = deque()
+            for file_path in file_paths:
+                if len(submitted) >= window:
+                    yield submitted.popleft().result()
+                submitted.append(executor.submit(analyze_file, file_path))
+            while submitted:
+                yield submitted.popleft().result()
+    
     def process_file(self, file_path: Path) -> ProcessingResult:
         """
         Process a single file, translating Japanese comments to English.
@@ -146,81 +311,88 @@ class Processor:
         Returns:
             Processing result
         """
+        result = self._process_analysis(analyze_file(file_path))
+        self._display_changes(result)
+        return result
+    
+    def _process_analysis(self, analysis: FileAnalysis) -> ProcessingResult:
+        """
+        Translate the Japanese text found in a file and write the changes.
+        
+        Args:
+            analysis: Analysis of the file to process
+            
+        Returns:
+            Processing result
+        """
+        file_path = analysis.file_path
+        
         if self.verbose:
             self.console.print(f"Processing file: {file_path}")
             
         result = ProcessingResult(file_path=file_path)
         
-        # Check if file exists
-        if not file_path.exists() or not file_path.is_file():
+        if not analysis.exists:
             logger.error(f"File not found: {file_path}")
             return result
             
-        # Get parser for file
-        parser = ParserFactory.get_parser_for_file(file_path)
-        if not parser:
+        if not analysis.has_parser:
             if self.verbose:
                 self.console.print(f"[yellow]No parser available for {file_path}[/]")
             return result
             
+        if analysis.error:
+            logger.error(f"Error processing file {file_path}: {analysis.error}")
+            result.error = analysis.error
+            return result
+            
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
+            content = analysis.content
+            comments = analysis.comments
             result.original_content = content
-            
-            # Parse comments
-            comments = parser.parse_file(file_path)
             result.comments_found = len(comments)
             
             if self.verbose:
                 self.console.print(f"Found {len(comments)} comments in {file_path}")
                 
-            # Process each comment
+            # Collect the Japanese segments of every comment
             japanese_comments = []
-            translations = []
+            pending: List[Tuple[CodeComment, JapaneseTextSpan]] = []
             
-            for comment in comments:
-                # Extract Japanese text with context
-                japanese_segments = extract_japanese_text_with_context(comment.content)
-                
-                if japanese_segments:
+            for comment, spans in zip(comments, analysis.comment_spans):
+                if spans:
                     japanese_comments.append(comment)
+                    pending.extend((comment, span) for span in spans)
                     
-                    # Translate Japanese segments
-                    for context_before, japanese_text, context_after in japanese_segments:
-                        translation = self.translator.translate(
-                            japanese_text, context_before, context_after
-                        )
-                        translations.append((comment, translation))
+            # Translate the segments in batches, one API request per batch
+            translated: List[TranslationResult] = []
+            for batch in collect_translation_batch([span for _, span in pending]):
+                translated.extend(self.translator.batch_translate(
+                    [(span.text, span.context_before, span.context_after) for span in batch]
+                ))
+                
+            translations = [
+                (comment, translation)
+                for (comment, _), translation in zip(pending, translated)
+            ]
             
             result.japanese_comments_found = len(japanese_comments)
             result.comments_translated = len(translations)
             
             if translations:
                 result.has_changes = True
-                
-                # Preview changes
-                if self.verbose or self.dry_run:
-                    self.formatter.preview_file_changes(file_path, translations)
+                result.translations = translations
                 
                 # Apply changes if not in dry run mode
                 if not self.dry_run:
-                    updated_content = self._apply_translations(content, translations)
+                    updated_content = self._apply_translations(
+                        content, translations, [span for _, span in pending]
+                    )
                     result.updated_content = updated_content
                     
                     # Save changes
                     output_path = self._get_output_path(file_path)
-                    
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(updated_content)
-                        
-                    # Show diff
-                    if self.verbose:
-                        self.formatter.display_file_diff(
-                            file_path, content, updated_content
-                        )
+                    self._write_output(output_path, updated_content)
             else:
                 if self.verbose:
                     self.console.print(f"[yellow]No Japanese comments found in {file_path}[/]")
@@ -234,11 +406,72 @@ class Processor:
     def _apply_translations(
         self, 
         content: str, 
-        translations: List[Tuple[CodeComment, TranslationResult]]
+        translations: List[Tuple[CodeComment, TranslationResult]],
+        spans: List[JapaneseTextSpan]
     ) -> str:
         """
         Apply translations to the file content.
         
+        Each translated segment is spliced into its comment at the position
+        of its span, and the comments are spliced into the content by their
+        offsets in a single pass. Comments without usable offsets fall back
+        to a line-based replacement.
+        
+        Args:
+            content: Original file content
+            translations: List of (comment, translation) pairs
+            spans: Span of each translated segment within its comment's
+                content, in the same order as translations
+            
+        Returns:
+            Updated file content
+        """
+        # Group the translated segments by comment
+        by_comment: Dict[CodeComment, List[Tuple[JapaneseTextSpan, TranslationResult]]] = {}
+        for (comment, translation), span in zip(translations, spans):
+            by_comment.setdefault(comment, []).append((span, translation))
+            
+        # Offsets are only trusted if they still point at the comment text
+        located: List[Tuple[int, int, CodeComment]] = []
+        for comment in by_comment:
+            start, end = comment.start_offset, comment.end_offset
+            if start is None or end is None or content[start:end] != comment.content:
+                return self._apply_translations_by_line(content, translations)
+            located.append((start, end, comment))
+            
+        located.sort(key=lambda item: item[0])
+        parts = []
+        cursor = 0
+        for start, end, comment in located:
+            # Splice from the last segment backwards, so the positions of
+            # the earlier ones stay valid
+            updated = comment.content
+            for span, translation in sorted(
+                by_comment[comment], key=lambda item: item[0].start_pos, reverse=True
+            ):
+                updated = (
+                    updated[:span.start_pos] + translation.translated_text
+                    + updated[span.end_pos:]
+                )
+            if not comment.is_multiline:
+                # A "#" comment must stay on a single line
+                updated = ' '.join(updated.splitlines())
+                
+            parts.append(content[cursor:start])
+            parts.append(updated)
+            cursor = end
+            
+        parts.append(content[cursor:])
+        return ''.join(parts)
+    
+    def _apply_translations_by_line(
+        self, 
+        content: str, 
+        translations: List[Tuple[CodeComment, TranslationResult]]
+    ) -> str:
+        """
+        Apply translations to the file content line by line.
+        
         Args:
             content: Original file content
             translations: List of (comment, translation) pairs
@@ -254,16 +487,21 @@ class Processor:
             reverse=True
         )
         
-        lines = content.splitlines()
+        line_starts = line_offsets(content)
         
-        # Apply translations to each line
+        # Apply translations to each line, splicing only the affected line
+        # back into the content
         for comment, translation in sorted_translations:
             # Get the comment line
             line_idx = comment.line_number - 1
-            if line_idx >= len(lines):
+            if line_idx >= len(line_starts):
                 continue
                 
-            line = lines[line_idx]
+            line_start = line_starts[line_idx]
+            line_end = content.find('\n', line_start)
+            if line_end == -1:
+                line_end = len(content)
+            line = content[line_start:line_end]
             
             # Replace Japanese text with English translation in the line
             # This is a simplified approach and may need more sophisticated
@@ -282,9 +520,63 @@ class Processor:
                 else:
                     updated_line = line
                     
-            lines[line_idx] = updated_line
+            # Lines are visited bottom-up, so earlier line offsets stay valid
+            content = content[:line_start] + updated_line + content[line_end:]
+            
+        return content
+    
+    def _write_output(self, output_path: Path, content: str) -> None:
+        """
+        Write updated content to the output file.
+        
+        An existing file is replaced atomically through a temporary file in
+        the same directory, so an interrupted write never leaves a partially
+        written source file behind. Symlinks are followed, and the replaced
+        file keeps its permissions and, where permitted, its owner. If the
+        directory does not allow creating the temporary file, the file is
+        written in place instead.
+        
+        Args:
+            output_path: File to write
+            content: Content to write
+        """
+        parent = output_path.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+            
+        if not output_path.exists():
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                f.write(content)
+            return
             
-        return '\n'.join(lines)
+        # Replace the file a symlink points to, not the link itself
+        target = output_path.resolve()
+        st = os.stat(target)
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+            )
+        except PermissionError:
+            # A writable file in a read-only directory can still be updated
+            with open(target, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                f.write(content)
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                f.write(content)
+            # mkstemp creates the file as 0600 and owned by the current user;
+            # keep the original owner where permitted, then the permissions
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(tmp_name, st.st_uid, st.st_gid)
+                except PermissionError:
+                    pass
+            os.chmod(tmp_name, stat.S_IMODE(st.st_mode))
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
     
     def _get_output_path(self, file_path: Path) -> Path:
         """
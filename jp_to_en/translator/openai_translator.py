@@ -5,17 +5,42 @@ This module provides functionality to translate Japanese text to English
 using OpenAI's translate model.
 """
 
+import importlib.util
 import logging
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 import openai
+from openai.types.chat import ChatCompletionSystemMessageParam
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPT = (
+    "You are a professional translator specializing in translating programming "
+    "comments and documentation from Japanese to English. Maintain the technical "
+    "meaning and nuance. Provide only the translated text without explanations."
+)
 
-@dataclass
+# Connection pool shared by all requests of a translator. httpx is not a
+# declared dependency; openai releases that are not built on it keep their
+# default client.
+_HTTP_LIMITS: Optional[Any] = None
+if importlib.util.find_spec("httpx") is not None:
+    import httpx
+    
+    _HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+
+# A line of a numbered batch response, e.g. "3) Load the data"; matched with
+# finditer over the whole response rather than line by line
+_NUMBERED_LINE_RE = re.compile(r'^[ \t]*(\d+)[.)][ \t]*(.*)$', re.MULTILINE)
+
+
+@dataclass(slots=True)
 class TranslationResult:
     """Represents the result of a translation operation."""
     original_text: str
@@ -29,12 +54,17 @@ class TranslationResult:
 class OpenAITranslator:
     """Translator using OpenAI's API for Japanese to English translation."""
     
+    # Sent unchanged with every request, so it is built only once
+    _SYSTEM_MSG: ClassVar[ChatCompletionSystemMessageParam] = {"role": "system", "content": _SYSTEM_PROMPT}
+    
     def __init__(
         self, 
         api_key: str, 
         model: str = "text-translation-3", 
         max_retries: int = 3,
-        retry_delay: float = 1.0
+        retry_delay: float = 1.0,
+        max_concurrency: int = 8,
+        cache_size: int = 4096
     ):
         """
         Initialize the OpenAI translator.
@@ -44,12 +74,40 @@ class OpenAITranslator:
             model: Translation model to use
             max_retries: Maximum number of retries for failed API calls
             retry_delay: Initial delay between retries (in seconds)
+            max_concurrency: Maximum number of API requests in flight at once,
+                shared by all threads using this translator
+            cache_size: Maximum number of translations kept in memory
         """
         self.api_key = api_key
         self.model = model
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.client = openai.OpenAI(api_key=api_key)
+        self.max_concurrency = max(1, max_concurrency)
+        
+        # Held for the duration of each API request, so threads translating
+        # different files and the per-segment fallback share one limit
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrency)
+        if _HTTP_LIMITS is None:
+            self.client = openai.OpenAI(api_key=api_key)
+        else:
+            self.client = openai.OpenAI(
+                api_key=api_key,
+                # Keep connections alive between requests and, when the
+                # optional h2 package is installed, multiplex concurrent
+                # requests over HTTP/2 instead of opening a connection per
+                # worker thread
+                http_client=openai.DefaultHttpxClient(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=_HTTP_LIMITS
+                )
+            )
+        
+        # Successful translations keyed by (text, context_before, context_after),
+        # evicted least recently used first. Guarded by a lock because the
+        # per-segment fallback translates from worker threads.
+        self.cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[Tuple[str, str, str], TranslationResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def translate(
         self, 
@@ -70,31 +128,90 @@ class OpenAITranslator:
         """
         if not text.strip():
             return TranslationResult(original_text=text, translated_text=text)
+            
+        key = (text, context_before, context_after)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
         
         # Prepare prompt with context
         prompt = self._create_prompt(text, context_before, context_after)
         
+        translated_text = self._complete(prompt)
+        if translated_text is None:
+            return TranslationResult(original_text=text, translated_text=text)
+            
+        result = TranslationResult(
+            original_text=text,
+            translated_text=translated_text,
+            context_before=context_before,
+            context_after=context_after,
+            model_used=self.model
+        )
+        self._store_cached(key, result)
+        return result
+    
+    def _get_cached(self, key: Tuple[str, str, str]) -> Optional[TranslationResult]:
+        """
+        Look up a previous translation and mark it as recently used.
+        
+        Args:
+            key: Tuple (japanese_text, context_before, context_after)
+            
+        Returns:
+            The cached TranslationResult, or None if not cached
+        """
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+    
+    def _store_cached(self, key: Tuple[str, str, str], result: TranslationResult) -> None:
+        """
+        Remember a successful translation, evicting the oldest entry when full.
+        
+        Args:
+            key: Tuple (japanese_text, context_before, context_after)
+            result: Translation to cache
+        """
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _complete(self, prompt: str) -> Optional[str]:
+        """
+        Send a prompt to the API, retrying on rate limit and timeout errors.
+        
+        Args:
+            prompt: User prompt to send
+            
+        Returns:
+            The response text, or None if the request failed
+        """
         # Call API with retries
         for attempt in range(self.max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a professional translator specializing in translating programming comments and documentation from Japanese to English. Maintain the technical meaning and nuance. Provide only the translated text without explanations."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,  # Lower temperature for more consistent translations
-                )
-                
-                translated_text = response.choices[0].message.content.strip()
+                with self._request_slots:
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            self._SYSTEM_MSG,
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.3,  # Lower temperature for more consistent translations
+                    )
                 
-                return TranslationResult(
-                    original_text=text,
-                    translated_text=translated_text,
-                    context_before=context_before,
-                    context_after=context_after,
-                    model_used=self.model
-                )
+                content = response.choices[0].message.content
+                if content is None:
+                    # e.g. a refusal, which comes without message content
+                    logger.error("Translation error: the response has no content")
+                    return None
+                return content.strip()
                 
             except (openai.RateLimitError, openai.APITimeoutError) as e:
                 logger.warning(f"Rate limit or timeout error: {e}. Retrying in {self.retry_delay}s...")
@@ -103,11 +220,12 @@ class OpenAITranslator:
                     time.sleep(self.retry_delay * (2 ** attempt))
                 else:
                     logger.error(f"Failed to translate after {self.max_retries} attempts: {e}")
-                    return TranslationResult(original_text=text, translated_text=text)
                     
             except Exception as e:
                 logger.error(f"Translation error: {e}")
-                return TranslationResult(original_text=text, translated_text=text)
+                return None
+                
+        return None
     
     def batch_translate(
         self, 
@@ -116,45 +234,150 @@ class OpenAITranslator:
         """
         Translate multiple Japanese text segments in a batch.
         
+        All segments are sent in a single request as a numbered list. If the
+        response cannot be matched back to the segments, each segment is
+        translated with its own request instead; all requests of the translator
+        count towards max_concurrency.
+        Segments translated earlier with the same context are served from the
+        in-memory cache without a request.
+        
         Args:
             texts_with_context: List of tuples (japanese_text, context_before, context_after)
             
         Returns:
             List of TranslationResult objects
         """
-        results = []
+        cached = [
+            self._get_cached((text, context_before, context_after))
+            for text, context_before, context_after in texts_with_context
+        ]
+        missing = [item for item, result in zip(texts_with_context, cached) if result is None]
+        translated = iter(self._batch_translate_uncached(missing) if missing else [])
         
-        for text, context_before, context_after in texts_with_context:
-            result = self.translate(text, context_before, context_after)
-            results.append(result)
+        # Fill the gaps in order; the uncached results follow the missing items
+        return [
+            result if result is not None else next(translated)
+            for result in cached
+        ]
+    
+    def _batch_translate_uncached(
+        self, 
+        texts_with_context: List[Tuple[str, str, str]]
+    ) -> List[TranslationResult]:
+        """
+        Translate segments that are not in the cache.
+        
+        Args:
+            texts_with_context: List of tuples (japanese_text, context_before, context_after)
+            
+        Returns:
+            List of TranslationResult objects
+        """
+        if len(texts_with_context) <= 1:
+            return [self.translate(*item) for item in texts_with_context]
+            
+        response = self._complete(self._create_batch_prompt(texts_with_context))
+        translated_texts = (
+            self._parse_numbered_response(response, len(texts_with_context))
+            if response is not None else None
+        )
+        
+        if translated_texts is None:
+            logger.warning("Batch translation failed; translating segments one by one")
             
-            # Add a small delay to avoid rate limits
-            time.sleep(0.1)
+            # Issue the per-segment requests concurrently over the shared client;
+            # rate limits are handled by the retry logic in _complete
+            workers = min(self.max_concurrency, len(texts_with_context))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(
+                    lambda item: self.translate(*item), texts_with_context
+                ))
             
+        results = []
+        for (text, context_before, context_after), translated_text in zip(
+            texts_with_context, translated_texts
+        ):
+            result = TranslationResult(
+                original_text=text,
+                translated_text=translated_text,
+                context_before=context_before,
+                context_after=context_after,
+                model_used=self.model
+            )
+            self._store_cached((text, context_before, context_after), result)
+            results.append(result)
         return results
     
-    def _create_prompt(self, text: str, context_before: str, context_after: str) -> str:
+    def _create_batch_prompt(self, texts_with_context: List[Tuple[str, str, str]]) -> str:
         """
-        Create a prompt for the OpenAI API that includes the text and context.
+        Create a prompt that asks for several numbered translations at once.
         
         Args:
-            text: Japanese text to translate
-            context_before: Text appearing before the Japanese text
-            context_after: Text appearing after the Japanese text
+            texts_with_context: List of tuples (japanese_text, context_before, context_after)
             
         Returns:
             Formatted prompt string
         """
-        prompt = "Translate the following Japanese text to English:\n\n"
+        lines = [
+            "Translate each of the following numbered Japanese texts to English.",
+            "Reply with exactly one line per text, numbered the same way "
+            "(e.g. \"1) ...\"), and nothing else.",
+            "",
+        ]
         
-        if context_before:
-            prompt += f"Context before: {context_before}\n\n"
+        for number, (text, context_before, context_after) in enumerate(texts_with_context, 1):
+            lines.append(f"{number}) {text}")
             
-        prompt += f"Text to translate: {text}\n\n"
+            # Context is only a hint; keep it on one line so numbering stays unambiguous
+            if context_before:
+                lines.append(f"   Context before: {' '.join(context_before.split())}")
+            if context_after:
+                lines.append(f"   Context after: {' '.join(context_after.split())}")
+                
+        return "\n".join(lines)
+    
+    def _parse_numbered_response(self, response: str, count: int) -> Optional[List[str]]:
+        """
+        Parse a numbered batch response.
         
-        if context_after:
-            prompt += f"Context after: {context_after}\n\n"
+        Args:
+            response: Response text from the API
+            count: Number of translations expected
+            
+        Returns:
+            Translations in input order, or None if the response does not
+            contain each of the numbers 1 to count exactly once, each with a
+            non-empty translation
+        """
+        translations: Dict[int, str] = {}
+        for match in _NUMBERED_LINE_RE.finditer(response):
+            number = int(match.group(1))
+            translated_text = match.group(2).strip()
+            if number in translations or not translated_text:
+                return None
+            translations[number] = translated_text
+                
+        if sorted(translations) != list(range(1, count + 1)):
+            return None
             
-        prompt += "Translation:"
+        return [translations[number] for number in range(1, count + 1)]
+    
+    def _create_prompt(self, text: str, context_before: str, context_after: str) -> str:
+        """
+        Create a prompt for the OpenAI API that includes the text and context.
         
-        return prompt
+        Args:
+            text: Japanese text to translate
+            context_before: Text appearing before the Japanese text
+            context_after: Text appearing after the Japanese text
+            
+        Returns:
+            Formatted prompt string
+        """
+        return "".join((
+            "Translate the following Japanese text to English:\n\n",
+            f"Context before: {context_before}\n\n" if context_before else "",
+            f"Text to translate: {text}\n\n",
+            f"Context after: {context_after}\n\n" if context_after else "",
+            "Translation:"
+        ))
@@ -22,17 +22,23 @@ setup(
     },
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     install_requires=[
-        "openai>=1.0.0",
+        "openai>=1.17.0",
         "langdetect>=1.0.9",
         "rich>=13.0.0",
         "regex>=2023.0.0",
     ],
+    extras_require={
+        # Faster parsing of configuration files
+        "orjson": ["orjson>=3.0.0"],
+        # HTTP/2 connections to the OpenAI API
+        "http2": ["httpx[http2]"],
+    },
     entry_points={
         "console_scripts": [
             "jp-to-en=jp_to_en.main:main",
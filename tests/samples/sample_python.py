@@ -59,8 +59,8 @@ class DataProcessor:
             成功した場合はTrue、失敗した場合はFalse
         """
         try:
-            with open(self.input_path, 'r', encoding='utf-8') as f:
-                self.data = f.readlines()  # 全行を読み込む
+            with open(self.input_path, 'r', encoding='utf-8', buffering=1 << 17) as f:
+                self.data = [line.rstrip('\n') for line in f]  # 改行を除いて1行ずつ読み込む
             return True
         except Exception as e:
             # エラーが発生した場合はログに記録
@@ -72,17 +72,8 @@ class DataProcessor:
         if not self.data:
             return  # データが空の場合は何もしない
             
-        # データの前処理
-        self.data = [line.strip() for line in self.data]
-        
-        # 空行を削除
-        self.data = [line for line in self.data if line]
-        
-        # 重複を削除
-        self.data = list(set(self.data))
-        
-        # データをソート
-        self.data.sort()
+        # 前後の空白を除去し、空行と重複を削除してソートする
+        self.data = sorted(set(filter(None, (line.strip() for line in self.data))))
     
     def save_data(self) -> bool:
         """
@@ -95,9 +86,8 @@ class DataProcessor:
             # 出力ディレクトリが存在しない場合は作成
             os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
             
-            with open(self.output_path, 'w', encoding='utf-8') as f:
-                for line in self.data:
-                    f.write(line + '\n')  # 各行を書き込む
+            with open(self.output_path, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                f.write(''.join(f"{line}\n" for line in self.data))  # 全行をまとめて書き込む
             return True
         except Exception as e:
             # 保存中にエラーが発生した場合
@@ -0,0 +1,43 @@
+"""
+Test cases for the configuration manager module.
+"""
+
+import tempfile
+import unittest
+
+from src.config_manager import ConfigManager
+
+
+class TestConfigManager(unittest.TestCase):
+    """Test suite for the configuration manager."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_manager = ConfigManager(config_dir=self.temp_dir.name)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        self.temp_dir.cleanup()
+    
+    def test_get_config_value(self):
+        """Test looking up and setting dot-separated configuration keys."""
+        self.config_manager.set_config_value("processor.concurrency", 4)
+        self.assertEqual(self.config_manager.get_config_value("processor.concurrency"), 4)
+        self.assertEqual(self.config_manager.get_config_value("processor.missing", 1), 1)
+        self.assertIsNone(self.config_manager.get_config_value("processor.concurrency.x"))
+    
+    def test_get_config_value_sees_direct_changes(self):
+        """Test that changes made through get_config are visible to lookups."""
+        self.config_manager.set_config_value("processor.concurrency", 8)
+        self.assertEqual(self.config_manager.get_config_value("processor.concurrency"), 8)
+        
+        self.config_manager.get_config()["processor"]["concurrency"] = 2
+        self.assertEqual(self.config_manager.get_config_value("processor.concurrency"), 2)
+        
+        self.config_manager.get_config_value("processor")["concurrency"] = 3
+        self.assertEqual(self.config_manager.get_config_value("processor.concurrency"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,9 @@ import unittest
 from src.detector.japanese_detector import (
     contains_japanese_chars,
     is_japanese_text,
+    detect_batch,
     find_japanese_spans,
+    collect_translation_batch,
     extract_japanese_text_with_context
 )
 
@@ -46,6 +48,20 @@ class TestJapaneseDetector(unittest.TestCase):
         # Test with short text that has some Japanese
         self.assertTrue(is_japanese_text("あa"))  # 50% Japanese
     
+    def test_detect_batch(self):
+        """Test that batch detection matches detecting each text on its own."""
+        texts = [
+            "",
+            "Hello World",
+            "こんにちは",
+            "あa",
+            "これは a test です",
+            "This function loads the configuration file and returns a dict. 設定",
+            "この関数は設定ファイルを読み込み、辞書を返します。",
+        ]
+        self.assertEqual(detect_batch(texts), [is_japanese_text(text) for text in texts])
+        self.assertEqual(detect_batch([]), [])
+    
     def test_find_japanese_spans(self):
         """Test finding Japanese spans in text."""
         # Test with simple Japanese text
@@ -65,11 +81,46 @@ class TestJapaneseDetector(unittest.TestCase):
         self.assertEqual(len(spans), 2)
         self.assertTrue("Hello " in spans[0].context_before)
         self.assertTrue(". This" in spans[0].context_after)
+        self.assertTrue(spans[0].before_endswith("Hello "))
+        self.assertTrue(spans[0].after_startswith(". This"))
+        self.assertFalse(spans[0].before_endswith("Hello"))
+        self.assertFalse(spans[0].after_startswith("This"))
         
         # Test with no Japanese text
         spans = find_japanese_spans("Hello World")
         self.assertEqual(len(spans), 0)
     
+    def test_find_japanese_spans_word_boundaries(self):
+        """Test that spans keep dotted identifiers and end at full-width sentence ends."""
+        spans = find_japanese_spans("config.jsonを読み込む. self.valueを更新する")
+        self.assertEqual([span.text for span in spans], ["config.jsonを読み込む", "self.valueを更新する"])
+        
+        spans = find_japanese_spans("これは config.json です")
+        self.assertEqual([span.text for span in spans], ["これは config.json です"])
+        
+        spans = find_japanese_spans("終了。次へ！本当ですか？")
+        self.assertEqual([span.text for span in spans], ["終了", "次へ", "本当ですか"])
+        self.assertTrue(spans[0].after_startswith("。"))
+    
+    def test_text_without_japanese(self):
+        """Test that empty and English-only text is rejected up front."""
+        for text in ("", "Hello World", "x = 10  # TODO"):
+            self.assertFalse(is_japanese_text(text))
+            self.assertEqual(find_japanese_spans(text), [])
+    
+    def test_collect_translation_batch(self):
+        """Test grouping spans into translation batches."""
+        spans = find_japanese_spans("あいう. かき. さしすせそたち. な")
+        batches = collect_translation_batch(spans, max_chars=5)
+        
+        # Spans keep their order; a span longer than max_chars is batched alone
+        self.assertEqual(
+            [[span.text for span in batch] for batch in batches],
+            [["あいう", "かき"], ["さしすせそたち"], ["な"]]
+        )
+        self.assertEqual(collect_translation_batch([]), [])
+        self.assertEqual(len(collect_translation_batch(spans)), 1)
+    
     def test_extract_japanese_text_with_context(self):
         """Test extracting Japanese text with context."""
         # Test with mixed text
@@ -0,0 +1,78 @@
+"""
+Test cases for the OpenAI translator module.
+"""
+
+import re
+import unittest
+
+from src.translator.openai_translator import OpenAITranslator
+
+
+class TestOpenAITranslator(unittest.TestCase):
+    """Test suite for the OpenAI translator, with the API calls stubbed out."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.translator = OpenAITranslator(api_key="test-key")
+        self.batch_response = ""
+        self.prompts = []
+        self.translator._complete = self._complete
+    
+    def _complete(self, prompt):
+        """Answer batch prompts with batch_response and single prompts per text."""
+        self.prompts.append(prompt)
+        if prompt.startswith("Translate each"):
+            return self.batch_response
+        return "single: " + re.search(r"Text to translate: (.*)", prompt).group(1)
+    
+    def test_batch_translate_numbered_response(self):
+        """Test that a numbered response is matched back to the segments."""
+        self.batch_response = "2) Second\n1) First"
+        
+        results = self.translator.batch_translate([("一つ目", "", ""), ("二つ目", "# ", "")])
+        
+        self.assertEqual([r.translated_text for r in results], ["First", "Second"])
+        self.assertEqual([r.original_text for r in results], ["一つ目", "二つ目"])
+        self.assertEqual(len(self.prompts), 1)
+    
+    def test_batch_translate_falls_back_per_segment(self):
+        """Test that unusable numbered responses are translated segment by segment."""
+        items = [("一つ目", "", ""), ("二つ目", "", "")]
+        for response in (
+            "1) First",  # Missing number
+            "1) First\n2) Second\n2) Again",  # Duplicate number
+            "1) First\n2)",  # Empty translation
+        ):
+            with self.subTest(response=response):
+                translator = OpenAITranslator(api_key="test-key")
+                translator._complete = self._complete
+                self.batch_response = response
+                
+                results = translator.batch_translate(items)
+                
+                self.assertEqual(
+                    [r.translated_text for r in results], ["single: 一つ目", "single: 二つ目"]
+                )
+    
+    def test_batch_translate_uses_cache(self):
+        """Test that translated segments are not requested again."""
+        self.batch_response = "1) First\n2) Second"
+        items = [("一つ目", "", ""), ("二つ目", "", "")]
+        self.translator.batch_translate(items)
+        
+        results = self.translator.batch_translate(items)
+        
+        self.assertEqual([r.translated_text for r in results], ["First", "Second"])
+        self.assertEqual(len(self.prompts), 1)
+    
+    def test_parse_numbered_response(self):
+        """Test parsing numbered batch responses."""
+        parse = self.translator._parse_numbered_response
+        self.assertEqual(parse("1. One\n  2) Two  \n", 2), ["One", "Two"])
+        self.assertIsNone(parse("1) One\n3) Three", 2))
+        self.assertIsNone(parse("1) One\n1) Again\n2) Two", 2))
+        self.assertIsNone(parse("1) One\n2)   ", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
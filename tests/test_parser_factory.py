@@ -0,0 +1,48 @@
+"""
+Test cases for the parser factory module.
+"""
+
+import unittest
+from pathlib import Path
+
+from src.parser.parser_factory import ParserFactory
+
+
+class TestParserFactory(unittest.TestCase):
+    """Test suite for the parser factory."""
+    
+    def test_parser_shared_per_extension(self):
+        """Test that files with the same extension share a parser instance."""
+        parser = ParserFactory.get_parser_for_file(Path("a.py"))
+        self.assertIsNotNone(parser)
+        self.assertIs(ParserFactory.get_parser_for_file(Path("pkg/b.py")), parser)
+        self.assertIs(ParserFactory.get_parser_for_file(Path("C.PY")), parser)
+    
+    def test_unsupported_extension(self):
+        """Test that unsupported extensions have no parser."""
+        self.assertIsNone(ParserFactory.get_parser_for_file(Path("README.md")))
+        self.assertNotIn(".md", ParserFactory.get_supported_extensions())
+    
+    def test_register_parser_replaces_cached_instance(self):
+        """Test that registering a parser replaces the cached instance."""
+        
+        class DummyParser:
+            def parse_file(self, file_path):
+                return []
+            
+            def parse_string(self, content, filename=None):
+                return []
+        
+        ParserFactory.get_parser_for_file(Path("a.dummy"))
+        ParserFactory.register_parser(".DUMMY", DummyParser)
+        try:
+            parser = ParserFactory.get_parser_for_file(Path("a.dummy"))
+            self.assertIsInstance(parser, DummyParser)
+            self.assertIn(".dummy", ParserFactory.get_supported_extensions())
+        finally:
+            ParserFactory._parsers.pop(".dummy", None)
+            ParserFactory._instance_cache.pop(".dummy", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Test cases for the processor module.
+"""
+
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.detector.japanese_detector import find_japanese_spans
+from src.parser.parser_base import CodeComment
+from src.parser.python_parser import PythonParser
+from src.processor import Processor
+from src.translator.openai_translator import TranslationResult
+
+
+class TestProcessor(unittest.TestCase):
+    """Test suite for the processor."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.processor = Processor(api_key="test-key")
+        
+        # Create a temporary directory for test files
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        self.temp_dir.cleanup()
+    
+    def test_apply_translations_comment(self):
+        """Test splicing translations into a "#" comment."""
+        content = "x = 1  # 日本語のコメント. 二つ目\ny = 2\n"
+        updated = self._translate(content, [
+            (0, 0, "A Japanese comment"),
+            (0, 1, "Second\nline"),
+        ])
+        
+        # A "#" comment stays on one line
+        self.assertEqual(updated, "x = 1  # A Japanese comment. Second line\ny = 2\n")
+    
+    def test_apply_translations_docstring_with_escapes(self):
+        """Test splicing a translation into a docstring that contains escapes."""
+        content = 'def f():\n    """説明です. \\x41 引用\n    二行目"""\n'
+        updated = self._translate(content, [
+            (0, 0, "Description"),
+            (0, 1, "Quote"),
+            (0, 2, "Second line"),
+        ])
+        
+        self.assertEqual(
+            updated, 'def f():\n    """Description. \\x41 Quote\n    Second line"""\n'
+        )
+    
+    def test_apply_translations_repeated_segment(self):
+        """Test that a segment is replaced at its own position, not at an earlier match."""
+        content = "# データを読む. 読む\n"
+        
+        # The first segment failed to translate and came back unchanged
+        updated = self._translate(content, [(0, 0, "データを読む"), (0, 1, "Read")])
+        
+        self.assertEqual(updated, "# データを読む. Read\n")
+    
+    def test_apply_translations_identical_comments(self):
+        """Test that only the translated one of two identical comments changes."""
+        content = "# 同じコメント\nx = 1\n# 同じコメント\n"
+        updated = self._translate(content, [(1, 0, "Same comment")])
+        
+        self.assertEqual(updated, "# 同じコメント\nx = 1\n# Same comment\n")
+    
+    def test_apply_translations_falls_back_by_line(self):
+        """Test the line-based replacement for comments whose offsets do not match."""
+        content = "x = 1\n# 日本語\n"
+        comment = CodeComment(
+            content="日本語", line_number=2, column=0, is_multiline=False,
+            start_offset=0, end_offset=3
+        )
+        updated = self._translate(content, [(0, 0, "Japanese")], comments=[comment])
+        
+        self.assertEqual(updated, "x = 1\n# Japanese\n")
+    
+    def test_process_file_without_japanese(self):
+        """Test that files without Japanese text are left alone without parsing."""
+        test_file = self.temp_path / "english.py"
+        test_file.write_text("# English comment\nx = 1  # Another\n", encoding='utf-8')
+        
+        result = self.processor.process_file(test_file)
+        
+        self.assertIsNone(result.error)
+        self.assertFalse(result.has_changes)
+        self.assertEqual(result.comments_found, 0)
+        self.assertEqual(test_file.read_text(encoding='utf-8'), "# English comment\nx = 1  # Another\n")
+    
+    def test_process_files_previews_on_calling_thread(self):
+        """Test that previews of files translated concurrently are printed in one place."""
+        processor = Processor(api_key="test-key", dry_run=True, concurrency=4)
+        processor.translator.batch_translate = lambda items: [
+            TranslationResult(original_text=text, translated_text="English")
+            for text, _, _ in items
+        ]
+        previews = []
+        processor.formatter.preview_file_changes = (
+            lambda file_path, translations: previews.append(
+                (threading.current_thread(), file_path, len(translations))
+            )
+        )
+        paths = []
+        for i in range(8):
+            path = self.temp_path / f"preview_{i}.py"
+            path.write_text(f"# コメント{i}\nx = 1  # 二つ目\n", encoding='utf-8')
+            paths.append(path)
+        
+        summary = processor.process_files(paths)
+        
+        self.assertEqual(summary.translated_comments, 16)
+        self.assertEqual(sorted(path for _, path, _ in previews), sorted(paths))
+        for thread, _, count in previews:
+            self.assertIs(thread, threading.current_thread())
+            self.assertEqual(count, 2)
+        self.assertEqual(paths[0].read_text(encoding='utf-8'), "# コメント0\nx = 1  # 二つ目\n")
+    
+    def test_write_output_keeps_permissions(self):
+        """Test that replacing a file keeps its permissions."""
+        target = self.temp_path / "target.py"
+        target.write_text("old\n", encoding='utf-8')
+        os.chmod(target, 0o640)
+        
+        self.processor._write_output(target, "new\n")
+        
+        self.assertEqual(target.read_text(encoding='utf-8'), "new\n")
+        self.assertEqual(stat.S_IMODE(os.stat(target).st_mode), 0o640)
+        self.assertEqual(sorted(p.name for p in self.temp_path.iterdir()), ["target.py"])
+    
+    def test_write_output_follows_symlinks(self):
+        """Test that writing through a symlink updates the file it points to."""
+        target = self.temp_path / "target.py"
+        target.write_text("old\n", encoding='utf-8')
+        link = self.temp_path / "link.py"
+        link.symlink_to(target)
+        
+        self.processor._write_output(link, "new\n")
+        
+        self.assertTrue(link.is_symlink())
+        self.assertEqual(target.read_text(encoding='utf-8'), "new\n")
+    
+    def test_write_output_in_place_without_temp_file(self):
+        """Test that a file is written in place when no temporary file can be created."""
+        target = self.temp_path / "target.py"
+        target.write_text("old\n", encoding='utf-8')
+        link = self.temp_path / "link.py"
+        link.symlink_to(target)
+        
+        with mock.patch("tempfile.mkstemp", side_effect=PermissionError):
+            self.processor._write_output(link, "new\n")
+        
+        self.assertTrue(link.is_symlink())
+        self.assertEqual(target.read_text(encoding='utf-8'), "new\n")
+    
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "changing owners needs root")
+    def test_write_output_keeps_owner(self):
+        """Test that replacing a file keeps its owner and group."""
+        target = self.temp_path / "target.py"
+        target.write_text("old\n", encoding='utf-8')
+        os.chown(target, 65534, 65534)
+        
+        self.processor._write_output(target, "new\n")
+        
+        st = os.stat(target)
+        self.assertEqual((st.st_uid, st.st_gid), (65534, 65534))
+    
+    def _translate(self, content, replacements, comments=None):
+        """Apply (comment index, span index, translated text) replacements to content."""
+        if comments is None:
+            comments = PythonParser().parse_string(content)
+        translations = []
+        spans = []
+        for index, span_index, translated in replacements:
+            span = find_japanese_spans(comments[index].content)[span_index]
+            spans.append(span)
+            translations.append((
+                comments[index],
+                TranslationResult(original_text=span.text, translated_text=translated)
+            ))
+        return self.processor._apply_translations(content, translations, spans)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,10 @@ Test cases for the Python parser module.
 """
 
 import os
+import sys
 import tempfile
 import unittest
+import warnings
 from pathlib import Path
 
 from src.parser.python_parser import PythonParser
@@ -14,17 +16,20 @@ from src.parser.parser_base import CodeComment
 class TestPythonParser(unittest.TestCase):
     """Test suite for the Python parser."""
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """Set up test environment."""
-        self.parser = PythonParser()
+        cls.parser = PythonParser()
         
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.temp_path = Path(self.temp_dir.name)
+        # Create a temporary directory shared by all tests; each test uses
+        # its own file names
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.temp_path = Path(cls.temp_dir.name)
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment."""
-        self.temp_dir.cleanup()
+        cls.temp_dir.cleanup()
     
     def test_supported_extensions(self):
         """Test supported file extensions."""
@@ -151,11 +156,96 @@ def function():
         self.assertEqual(comments[2].content, "\n    関数のドキュメント文字列です。\n    複数行に渡ります。\n    ")
         self.assertTrue(comments[2].is_multiline)
     
+    def test_comment_offsets(self):
+        """Test that comment offsets point at the comment content."""
+        test_content = '''x = 10  #   Inline comment
+def function():
+    r"""Raw docstring."""
+    pass
+'''
+        comments = self.parser.parse_string(test_content)
+        
+        self.assertEqual(len(comments), 2)
+        for comment in comments:
+            self.assertEqual(
+                test_content[comment.start_offset:comment.end_offset], comment.content
+            )
+    
+    @unittest.skipIf(sys.version_info < (3, 12), "nested f-string quotes need Python 3.12")
+    def test_parse_fstring_with_nested_quotes(self):
+        """Test that a "#" inside a PEP 701 f-string is not taken for a comment."""
+        test_content = 'd = {"#": 1}\nprint(f"{d["#"]} 日本語")  # コメント\n'
+        comments = self.parser.parse_string(test_content)
+        
+        self.assertEqual([comment.content for comment in comments], ["コメント"])
+        self.assertEqual(comments[0].line_number, 2)
+        self.assertEqual(
+            test_content[comments[0].start_offset:comments[0].end_offset], "コメント"
+        )
+    
+    def test_parse_file_cache_invalidation(self):
+        """Test that a file is parsed again once its size or modification time changes."""
+        test_file = self._create_test_file("cached.py", "# 一つ目\n")
+        self.assertEqual([c.content for c in self.parser.parse_file(test_file)], ["一つ目"])
+        
+        # Different size
+        test_file.write_text("# 二つ目です\n", encoding='utf-8')
+        self.assertEqual([c.content for c in self.parser.parse_file(test_file)], ["二つ目です"])
+        
+        # Same size, different modification time
+        mtime_ns = test_file.stat().st_mtime_ns
+        test_file.write_text("# 三つ目です\n", encoding='utf-8')
+        os.utime(test_file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+        self.assertEqual([c.content for c in self.parser.parse_file(test_file)], ["三つ目です"])
+    
+    def test_parse_file_uses_subclass_parse_string(self):
+        """Test that parse_file goes through the parse_string of a subclass."""
+        
+        class UpperParser(PythonParser):
+            def parse_string(self, content, filename=None):
+                return super().parse_string(content.upper(), filename)
+        
+        test_file = self._create_test_file("subclass.py", "# comment\n")
+        self.assertEqual([c.content for c in self.parser.parse_file(test_file)], ["comment"])
+        self.assertEqual([c.content for c in UpperParser().parse_file(test_file)], ["COMMENT"])
+    
+    def test_parse_paths(self):
+        """Test parsing many files in process and in worker processes."""
+        first = self._create_test_file("paths_first.py", "# 一つ目\n")
+        second = self._create_test_file("paths_second.py", "x = 1  # 二つ目\n")
+        paths = [first, second, first]
+        
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = self.parser.parse_paths(paths, workers=workers)
+                
+                self.assertEqual(list(results), [first, second])
+                self.assertEqual([c.content for c in results[first]], ["一つ目"])
+                self.assertEqual([c.content for c in results[second]], ["二つ目"])
+    
+    def test_parse_string_does_not_warn(self):
+        """Test that warnings about the parsed code are not shown."""
+        test_content = 'pattern = "\\d+"  # 数字\n'
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            comments = self.parser.parse_string(test_content, "escapes.py")
+        
+        self.assertEqual([comment.content for comment in comments], ["数字"])
+        self.assertEqual(caught, [])
+    
+    def test_code_comment_is_slotted_and_hashable(self):
+        """Test that comments are compact and can be used as dict keys."""
+        comment = CodeComment(content="Comment", line_number=1, column=0, is_multiline=False)
+        
+        self.assertFalse(hasattr(comment, "__dict__"))
+        self.assertEqual({comment: 1}[comment], 1)
+        with self.assertRaises(AttributeError):
+            comment.content = "Changed"
+    
     def _create_test_file(self, filename: str, content: str) -> Path:
         """Create a test file with the given content."""
         file_path = self.temp_path / filename
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        file_path.write_text(content, encoding='utf-8')
         return file_path
 
 